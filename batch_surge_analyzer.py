@@ -7,174 +7,250 @@ Batch Stock Surge Analyzer
 import asyncio
 import sys
 import os
-from datetime import datetime
-import pandas as pd
+from pathlib import Path
+import time
+import hashlib
+from datetime import datetime, timedelta
 import json
+from asyncio_throttle import Throttler
 
-# 添加当前目录到Python路径
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+# orjson为可选加速依赖，缺失时回退到标准库json
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-from universal_surge_analyzer import UniversalSurgeAnalyzer
+# 添加当前目录到Python路径（解析一次，后续复用）
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE))
+
+from config import APIConfig, CacheConfig
 
 
 class BatchSurgeAnalyzer:
     """批量暴涨分析器"""
-    
+
     def __init__(self):
-        self.analyzer = UniversalSurgeAnalyzer()
+        # 延迟导入：akshare/pandas链路加载较重，只在真正分析时引入
+        from universal_surge_analyzer import get_analyzer
+
+        self.analyzer = get_analyzer()
         self.results = []
-    
+        self.api_config = APIConfig()
+        self.cache_config = CacheConfig()
+        # 令牌桶挂在实例上，多次批量调用共享同一配额
+        self.throttler = Throttler(
+            rate_limit=self.api_config.requests_per_minute, period=60
+        )
+
+    def _cache_path(self, symbol, days):
+        """计算单只股票当日分析结果的缓存路径"""
+        key = hashlib.md5(
+            f"{symbol}:{days}:{datetime.now().strftime('%Y%m%d')}".encode()
+        ).hexdigest()
+        return os.path.join(self.cache_config.cache_directory, symbol, f"{key}.json")
+
+    async def cached_analyze(self, symbol, name, days, start_date_str=None, end_date_str=None):
+        """带磁盘缓存的单股分析，同一天重复分析直接读缓存"""
+        cache_path = self._cache_path(symbol, days)
+
+        if os.path.exists(cache_path):
+            age = time.time() - os.path.getmtime(cache_path)
+            if age < self.cache_config.historical_data_ttl:
+                try:
+                    with open(cache_path, 'r', encoding='utf-8') as f:
+                        print(f"💾 {name} 命中缓存")
+                        return json.load(f)
+                except Exception:
+                    pass  # 缓存损坏时回退到实时分析
+
+        result = await self.analyzer.analyze_stock(
+            symbol, name, days,
+            start_date_str=start_date_str, end_date_str=end_date_str
+        )
+        if result:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            with open(cache_path, 'w', encoding='utf-8') as f:
+                json.dump(result, f, ensure_ascii=False, default=str)
+
+        return result
+
     async def analyze_stock_list(self, stock_list, days=180):
         """分析股票列表"""
+        # 按代码去重（保留首次出现的名称），避免重复请求同一只股票
+        unique_stocks = {}
+        for symbol, name in stock_list:
+            unique_stocks.setdefault(symbol, name)
+        stock_list = list(unique_stocks.items())
+
         print(f"🚀 批量股票暴涨分析")
         print(f"📊 分析股票数量: {len(stock_list)}")
         print(f"📅 分析周期: {days}天")
         print("=" * 60)
-        
-        for i, (symbol, name) in enumerate(stock_list, 1):
-            print(f"\n[{i}/{len(stock_list)}] 正在分析: {name}({symbol})")
-            print("-" * 40)
-            
-            try:
-                result = await self.analyzer.analyze_stock(symbol, name, days)
-                if result:
-                    # 添加汇总信息
-                    summary = self._create_summary(symbol, name, result)
-                    self.results.append(summary)
-                    
-                    print(f"✅ {name} 分析完成")
-                else:
-                    print(f"❌ {name} 分析失败")
-                    
-            except Exception as e:
-                print(f"❌ {name} 分析出错: {e}")
-            
-            # 添加延迟避免请求过快
-            if i < len(stock_list):
-                await asyncio.sleep(1)
-        
+
+        # 整批股票共用同一对日期串：strftime只算一次，
+        # 且全批的抓取缓存key在跨越分钟/午夜时仍保持一致
+        end_date = datetime.now()
+        start_date_str = (end_date - timedelta(days=days)).strftime("%Y%m%d")
+        end_date_str = end_date.strftime("%Y%m%d")
+
+        # 并发分析，用信号量限制并发数、令牌桶限制请求频率
+        semaphore = asyncio.Semaphore(self.api_config.max_concurrent_requests)
+
+        async def _analyze_one(symbol, name):
+            async with semaphore:
+                async with self.throttler:
+                    return await self.cached_analyze(
+                        symbol, name, days, start_date_str, end_date_str
+                    )
+
+        tasks = [asyncio.create_task(_analyze_one(symbol, name)) for symbol, name in stock_list]
+        task_results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        # 汇总进度信息按批量写出，避免逐行print频繁刷新stdout
+        status_lines = []
+        for (symbol, name), result in zip(stock_list, task_results):
+            if isinstance(result, Exception):
+                status_lines.append(f"❌ {name} 分析出错: {result}")
+            elif result:
+                # 添加汇总信息
+                summary = self._create_summary(symbol, name, result)
+                self.results.append(summary)
+
+                status_lines.append(f"✅ {name} 分析完成")
+            else:
+                status_lines.append(f"❌ {name} 分析失败")
+
+        sys.stdout.write("\n".join(status_lines) + "\n")
+
         # 生成汇总报告
         self._generate_summary_report()
-        
+
         return self.results
     
     def _create_summary(self, symbol, name, result):
         """创建股票汇总信息"""
-        basic = result['basic']
-        surges = result['surges']
-        volume = result['volume']
-        company = result['company']
-        
-        return {
-            'symbol': symbol,
-            'name': name,
-            'current_price': basic['current_price'],
-            'total_return': basic['total_return'],
-            'volatility': basic['volatility'],
-            'surge_count': len(surges),
-            'volume_spike_count': len(volume['spikes']),
-            'max_surge': max([s['return'] for s in surges]) if surges else 0,
-            'industry': company.get('行业', '未知'),
-            'market_cap': company.get('总市值', '未知'),
-            'analysis_time': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        }
+        summary = result.get('summary')
+
+        if summary is None:
+            # 兼容没有预平铺summary的旧缓存结果，按嵌套结构展开
+            import numpy as np
+
+            basic = result['basic']
+            surges = result['surges']
+            volume = result['volume']
+            company = result['company']
+
+            # 用numpy数组求最大涨幅，避免构造中间Python列表
+            surge_returns = np.fromiter(
+                (s['return'] for s in surges), dtype=np.float64, count=len(surges)
+            )
+
+            summary = {
+                'current_price': basic['current_price'],
+                'total_return': basic['total_return'],
+                'volatility': basic['volatility'],
+                'surge_count': len(surges),
+                'volume_spike_count': len(volume['spikes']),
+                'max_surge': float(surge_returns.max()) if surge_returns.size else 0.0,
+                'industry': company.get('行业', '未知'),
+                'market_cap': company.get('总市值', '未知')
+            }
+
+        summary = dict(summary)
+        summary['symbol'] = symbol
+        summary['name'] = name
+        summary['analysis_time'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        return summary
     
     def _generate_summary_report(self):
         """生成汇总报告"""
         if not self.results:
             print("\n❌ 没有有效的分析结果")
             return
-        
-        print(f"\n" + "=" * 60)
-        print(f"📊 批量分析汇总报告")
-        print(f"📅 生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print("=" * 60)
-        
-        # 按暴涨频率排序
-        surge_ranking = sorted(self.results, key=lambda x: x['surge_count'], reverse=True)
-        
-        print(f"\n🚀 暴涨频率排行榜 (TOP 10):")
-        print("-" * 50)
-        for i, stock in enumerate(surge_ranking[:10], 1):
-            print(f"{i:2d}. {stock['name']:8s} ({stock['symbol']}) - {stock['surge_count']:2d}次暴涨, 涨幅{stock['total_return']:+6.1f}%")
-        
-        # 按收益率排序
-        return_ranking = sorted(self.results, key=lambda x: x['total_return'], reverse=True)
-        
-        print(f"\n📈 收益率排行榜 (TOP 10):")
-        print("-" * 50)
-        for i, stock in enumerate(return_ranking[:10], 1):
-            print(f"{i:2d}. {stock['name']:8s} ({stock['symbol']}) - 涨幅{stock['total_return']:+6.1f}%, {stock['surge_count']:2d}次暴涨")
-        
-        # 按波动率排序
-        volatility_ranking = sorted(self.results, key=lambda x: x['volatility'], reverse=True)
-        
-        print(f"\n📊 波动率排行榜 (TOP 10):")
-        print("-" * 50)
-        for i, stock in enumerate(volatility_ranking[:10], 1):
-            print(f"{i:2d}. {stock['name']:8s} ({stock['symbol']}) - 波动率{stock['volatility']:5.1f}%, 涨幅{stock['total_return']:+6.1f}%")
-        
-        # 行业分析
-        industry_stats = {}
-        for stock in self.results:
-            industry = stock['industry']
-            if industry not in industry_stats:
-                industry_stats[industry] = {
-                    'count': 0,
-                    'avg_return': 0,
-                    'avg_surge_count': 0,
-                    'stocks': []
-                }
-            
-            industry_stats[industry]['count'] += 1
-            industry_stats[industry]['avg_return'] += stock['total_return']
-            industry_stats[industry]['avg_surge_count'] += stock['surge_count']
-            industry_stats[industry]['stocks'].append(stock['name'])
-        
-        # 计算平均值
-        for industry in industry_stats:
-            count = industry_stats[industry]['count']
-            industry_stats[industry]['avg_return'] /= count
-            industry_stats[industry]['avg_surge_count'] /= count
-        
-        print(f"\n🏢 行业表现分析:")
-        print("-" * 50)
-        for industry, stats in sorted(industry_stats.items(), key=lambda x: x[1]['avg_return'], reverse=True):
-            print(f"{industry:12s}: {stats['count']:2d}只股票, 平均涨幅{stats['avg_return']:+6.1f}%, 平均暴涨{stats['avg_surge_count']:4.1f}次")
-        
+
+        import pandas as pd
+
+        # 报告内容先累积到行缓冲，最后一次性写出stdout
+        lines = []
+        lines.append("\n" + "=" * 60)
+        lines.append("📊 批量分析汇总报告")
+        lines.append(f"📅 生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        lines.append("=" * 60)
+
+        # 一次性载入DataFrame做列式排序/聚合，避免多趟Python排序
+        df = pd.DataFrame(self.results)
+
+        lines.append("\n🚀 暴涨频率排行榜 (TOP 10):")
+        lines.append("-" * 50)
+        for i, stock in enumerate(df.nlargest(10, 'surge_count').itertuples(), 1):
+            lines.append(f"{i:2d}. {stock.name:8s} ({stock.symbol}) - {stock.surge_count:2d}次暴涨, 涨幅{stock.total_return:+6.1f}%")
+
+        lines.append("\n📈 收益率排行榜 (TOP 10):")
+        lines.append("-" * 50)
+        for i, stock in enumerate(df.nlargest(10, 'total_return').itertuples(), 1):
+            lines.append(f"{i:2d}. {stock.name:8s} ({stock.symbol}) - 涨幅{stock.total_return:+6.1f}%, {stock.surge_count:2d}次暴涨")
+
+        lines.append("\n📊 波动率排行榜 (TOP 10):")
+        lines.append("-" * 50)
+        for i, stock in enumerate(df.nlargest(10, 'volatility').itertuples(), 1):
+            lines.append(f"{i:2d}. {stock.name:8s} ({stock.symbol}) - 波动率{stock.volatility:5.1f}%, 涨幅{stock.total_return:+6.1f}%")
+
+        # 行业分析：单次groupby聚合代替手工累加循环
+        industry_stats = (
+            df.groupby('industry', sort=False)
+            .agg(
+                count=('name', 'size'),
+                avg_return=('total_return', 'mean'),
+                avg_surge_count=('surge_count', 'mean')
+            )
+            .sort_values('avg_return', ascending=False)
+        )
+
+        lines.append("\n🏢 行业表现分析:")
+        lines.append("-" * 50)
+        for row in industry_stats.itertuples():
+            lines.append(f"{row.Index:12s}: {row.count:2d}只股票, 平均涨幅{row.avg_return:+6.1f}%, 平均暴涨{row.avg_surge_count:4.1f}次")
+
         # 投资建议
-        print(f"\n💡 投资建议:")
-        print("-" * 50)
-        
+        lines.append("\n💡 投资建议:")
+        lines.append("-" * 50)
+
         # 寻找高潜力股票
-        high_potential = [s for s in self.results if s['surge_count'] >= 5 and s['total_return'] > 10]
-        if high_potential:
-            print(f"🎯 高潜力股票 (暴涨≥5次且涨幅>10%):")
-            for stock in sorted(high_potential, key=lambda x: x['surge_count'], reverse=True)[:5]:
-                print(f"   • {stock['name']} ({stock['symbol']}): {stock['surge_count']}次暴涨, 涨幅{stock['total_return']:+.1f}%")
-        
+        high_potential = df[(df['surge_count'] >= 5) & (df['total_return'] > 10)]
+        if not high_potential.empty:
+            lines.append("🎯 高潜力股票 (暴涨≥5次且涨幅>10%):")
+            for stock in high_potential.nlargest(5, 'surge_count').itertuples():
+                lines.append(f"   • {stock.name} ({stock.symbol}): {stock.surge_count}次暴涨, 涨幅{stock.total_return:+.1f}%")
+
         # 寻找稳健股票
-        stable_stocks = [s for s in self.results if s['volatility'] < 3 and s['total_return'] > 5]
-        if stable_stocks:
-            print(f"\n📊 稳健增长股票 (波动率<3%且涨幅>5%):")
-            for stock in sorted(stable_stocks, key=lambda x: x['total_return'], reverse=True)[:5]:
-                print(f"   • {stock['name']} ({stock['symbol']}): 波动率{stock['volatility']:.1f}%, 涨幅{stock['total_return']:+.1f}%")
-        
+        stable_stocks = df[(df['volatility'] < 3) & (df['total_return'] > 5)]
+        if not stable_stocks.empty:
+            lines.append("\n📊 稳健增长股票 (波动率<3%且涨幅>5%):")
+            for stock in stable_stocks.nlargest(5, 'total_return').itertuples():
+                lines.append(f"   • {stock.name} ({stock.symbol}): 波动率{stock.volatility:.1f}%, 涨幅{stock.total_return:+.1f}%")
+
         # 风险提示
-        high_risk = [s for s in self.results if s['volatility'] > 8 or s['total_return'] < -20]
-        if high_risk:
-            print(f"\n⚠️ 高风险股票 (波动率>8%或跌幅>20%):")
-            for stock in sorted(high_risk, key=lambda x: x['volatility'], reverse=True)[:5]:
-                print(f"   • {stock['name']} ({stock['symbol']}): 波动率{stock['volatility']:.1f}%, 涨幅{stock['total_return']:+.1f}%")
+        high_risk = df[(df['volatility'] > 8) | (df['total_return'] < -20)]
+        if not high_risk.empty:
+            lines.append("\n⚠️ 高风险股票 (波动率>8%或跌幅>20%):")
+            for stock in high_risk.nlargest(5, 'volatility').itertuples():
+                lines.append(f"   • {stock.name} ({stock.symbol}): 波动率{stock.volatility:.1f}%, 涨幅{stock.total_return:+.1f}%")
+
+        sys.stdout.write("\n".join(lines) + "\n")
     
     def save_results(self, filename=None):
         """保存结果到文件"""
         if not filename:
             filename = f"batch_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(self.results, f, ensure_ascii=False, indent=2)
-        
+        if orjson is not None:
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(self.results, option=orjson.OPT_INDENT_2, default=str))
+        else:
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(self.results, f, ensure_ascii=False, indent=2, default=str)
+
         print(f"\n💾 分析结果已保存到: {filename}")
 
 
@@ -6,10 +6,35 @@
 import asyncio
 import sys
 import os
+from pathlib import Path
+import time
+import json
 from datetime import datetime, timedelta
 
-# 添加当前目录到Python路径
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+# 添加当前目录到Python路径（解析一次，后续复用）
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE))
+
+from config import CacheConfig
+
+# 工具调用结果缓存：同参数重复调用直接复用，避免重复akshare请求
+_TOOL_CACHE = {}
+_TOOL_CACHE_TTL = CacheConfig().indicator_result_ttl
+
+
+async def _cached_tool_call(tool_func, arguments):
+    """按 (工具名, 参数) 缓存MCP工具调用结果，TTL内直接返回"""
+    key = (tool_func.__name__, tuple(sorted(arguments.items())))
+    cached = _TOOL_CACHE.get(key)
+    if cached is not None:
+        result, cached_at = cached
+        if time.time() - cached_at < _TOOL_CACHE_TTL:
+            return result
+
+    result = await tool_func(arguments)
+    _TOOL_CACHE[key] = (result, time.time())
+    return result
+
 
 async def analyze_dexin_future_value():
     """深度分析德新科技未来投资价值"""
@@ -27,7 +52,7 @@ async def analyze_dexin_future_value():
         # 1. 长期表现分析（360天）
         print("\n📈 长期表现分析 (360天):")
         print("-" * 40)
-        long_term_result = await _analyze_single_stock({
+        long_term_result = await _cached_tool_call(_analyze_single_stock, {
             "symbol": "603032", 
             "name": "德新科技", 
             "days": 360
@@ -36,20 +61,17 @@ async def analyze_dexin_future_value():
         if long_term_result and len(long_term_result) > 0:
             result_text = long_term_result[0].text
             print(result_text)
-            
-            # 提取关键指标
-            lines = result_text.split('\n')
+
+            # 直接读取结构化指标，不再逐行匹配文本
             total_return = "未知"
             volatility = "未知"
             surge_count = "未知"
-            
-            for line in lines:
-                if "Total Return" in line:
-                    total_return = line.split(':')[-1].strip()
-                elif "Volatility" in line:
-                    volatility = line.split(':')[-1].strip()
-                elif "Surge Count" in line:
-                    surge_count = line.split(':')[-1].strip()
+
+            if len(long_term_result) > 1:
+                metrics = json.loads(long_term_result[1].text)
+                total_return = f"{metrics['total_return']:.2f}%"
+                volatility = f"{metrics['volatility']:.2f}%"
+                surge_count = str(metrics['surge_count'])
         else:
             print("⚠️ 无法获取德新科技的长期数据，将使用替代分析方式")
             total_return = "数据不足"
@@ -59,7 +81,7 @@ async def analyze_dexin_future_value():
         # 2. 科技股行业对比分析
         print("\n🏆 在科技股行业中的表现:")
         print("-" * 40)
-        industry_result = await _batch_analyze_stocks({
+        industry_result = await _cached_tool_call(_batch_analyze_stocks, {
             "preset": "tech", 
             "days": 180
         })
@@ -68,12 +90,16 @@ async def analyze_dexin_future_value():
         industry_performance = "未知"
         if industry_result and len(industry_result) > 0:
             result_text = industry_result[0].text
-            lines = result_text.split('\n')
-            for line in lines:
-                if "德新科技" in line or "603032" in line:
-                    industry_rank = "行业前列"
-                    industry_performance = "表现活跃"
-                    break
+
+            # 在结构化组合指标中查找，避免全文扫描
+            batch_symbols = set()
+            if len(industry_result) > 1:
+                payload = json.loads(industry_result[1].text)
+                batch_symbols = {s['symbol'] for s in payload.get('stocks', [])}
+
+            if "603032" in batch_symbols:
+                industry_rank = "行业前列"
+                industry_performance = "表现活跃"
             print(result_text)
         else:
             print("⚠️ 科技股行业对比数据获取受限")
@@ -81,7 +107,7 @@ async def analyze_dexin_future_value():
         # 3. 技术面分析
         print("\n📊 技术面分析:")
         print("-" * 40)
-        technical_analysis = await _get_surge_summary({
+        technical_analysis = await _cached_tool_call(_get_surge_summary, {
             "symbol": "603032", 
             "name": "德新科技", 
             "surge_threshold": 3.0  # 降低阈值获取更多技术信号
@@ -8,26 +8,45 @@ import os
 import sys
 import json
 import shutil
+import subprocess
 from pathlib import Path
 
 
 def install_dependencies():
     """安装依赖包"""
     print("📦 安装Python依赖包...")
-    
+
     dependencies = [
         "akshare",
-        "pandas", 
+        "pandas",
         "numpy",
         "mcp"
     ]
-    
+
+    # 一次性安装全部依赖，pip解析器只启动一次
+    result = subprocess.run(
+        [sys.executable, "-m", "pip", "install",
+         "--disable-pip-version-check", "--no-input", *dependencies],
+        check=False
+    )
+
+    if result.returncode == 0:
+        for dep in dependencies:
+            print(f"✅ {dep} 安装成功")
+        return
+
+    # 批量安装失败时逐个重试，定位失败的包
+    print("⚠️ 批量安装失败，逐个重试...")
     for dep in dependencies:
-        try:
-            os.system(f"pip install {dep}")
+        result = subprocess.run(
+            [sys.executable, "-m", "pip", "install",
+             "--disable-pip-version-check", "--no-input", dep],
+            check=False
+        )
+        if result.returncode == 0:
             print(f"✅ {dep} 安装成功")
-        except Exception as e:
-            print(f"❌ {dep} 安装失败: {e}")
+        else:
+            print(f"❌ {dep} 安装失败")
 
 
 def setup_mcp_config():
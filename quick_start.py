@@ -9,8 +9,9 @@ import sys
 import asyncio
 from pathlib import Path
 
-# 添加当前目录到Python路径
-sys.path.insert(0, str(Path(__file__).parent))
+# 添加当前目录到Python路径（解析一次，后续复用）
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE))
 
 
 def show_menu():
@@ -29,7 +30,7 @@ def show_menu():
 
 async def analyze_single_stock():
     """分析单只股票"""
-    from universal_surge_analyzer import UniversalSurgeAnalyzer
+    from universal_surge_analyzer import get_analyzer
     
     print("\n📊 单只股票分析")
     print("-" * 30)
@@ -42,7 +43,7 @@ async def analyze_single_stock():
         return
     
     try:
-        analyzer = UniversalSurgeAnalyzer()
+        analyzer = get_analyzer(verbose=True)
         print(f"\n🔍 正在分析 {name or symbol}...")
         result = await analyzer.analyze_stock(symbol, name or None, 180)
         
@@ -92,7 +93,7 @@ async def batch_analyze():
 
 async def compare_stocks():
     """对比股票"""
-    from universal_surge_analyzer import UniversalSurgeAnalyzer
+    from universal_surge_analyzer import get_analyzer
     
     print("\n🆚 股票对比分析")
     print("-" * 30)
@@ -107,14 +108,15 @@ async def compare_stocks():
         return
     
     try:
-        analyzer = UniversalSurgeAnalyzer()
-        
-        print(f"\n🔍 正在分析 {stock1_name}({stock1_symbol})...")
-        result1 = await analyzer.analyze_stock(stock1_symbol, stock1_name, 180)
-        
-        print(f"🔍 正在分析 {stock2_name}({stock2_symbol})...")
-        result2 = await analyzer.analyze_stock(stock2_symbol, stock2_name, 180)
-        
+        analyzer = get_analyzer(verbose=True)
+
+        # 两只股票互不依赖，并发抓取分析
+        print(f"\n🔍 正在分析 {stock1_name}({stock1_symbol}) 和 {stock2_name}({stock2_symbol})...")
+        result1, result2 = await asyncio.gather(
+            analyzer.analyze_stock(stock1_symbol, stock1_name, 180),
+            analyzer.analyze_stock(stock2_symbol, stock2_name, 180)
+        )
+
         if result1 and result2:
             # 简单对比
             print(f"\n📊 对比结果:")
@@ -140,13 +142,15 @@ async def compare_stocks():
         print(f"❌ 分析出错: {e}")
 
 
-def test_mcp_server():
+async def test_mcp_server():
     """测试MCP服务器"""
     print("\n🧪 测试MCP服务器")
     print("-" * 30)
-    
+
     try:
-        os.system("python test_mcp_server.py")
+        # 进程内直接调用，省去新解释器冷启动和重复导入
+        from test_mcp_server import main as test_main
+        await test_main()
     except Exception as e:
         print(f"❌ 测试失败: {e}")
 
@@ -185,7 +189,11 @@ async def main():
             break
         elif choice == "1":
             print("\n🔧 开始安装和配置...")
-            os.system("python install.py")
+            try:
+                from install import main as install_main
+                install_main()
+            except Exception as e:
+                print(f"❌ 安装失败: {e}")
         elif choice == "2":
             await analyze_single_stock()
         elif choice == "3":
@@ -193,7 +201,7 @@ async def main():
         elif choice == "4":
             await compare_stocks()
         elif choice == "5":
-            test_mcp_server()
+            await test_mcp_server()
         elif choice == "6":
             show_help()
         else:
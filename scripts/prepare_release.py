@@ -8,11 +8,31 @@ Release preparation script
 import os
 import sys
 import json
-import shutil
 import subprocess
+import zipfile
 from datetime import datetime
 from pathlib import Path
 
+# orjson为可选加速依赖，缺失时回退到标准库json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps(obj):
+    """序列化为2空格缩进的UTF-8字节"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def _loads(data):
+    """从UTF-8字节反序列化"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 def get_project_root():
     """获取项目根目录"""
@@ -38,8 +58,7 @@ def update_version_info(version, changes):
         }
     }
     
-    with open(version_file, 'w', encoding='utf-8') as f:
-        json.dump(version_info, f, indent=2, ensure_ascii=False)
+    version_file.write_bytes(_dumps(version_info))
     
     print(f"✓ Updated version info to {version}")
 
@@ -51,16 +70,16 @@ def run_tests():
     
     print("Running tests...")
     try:
-        # 运行基本测试
+        # 运行基本测试：成功路径只看返回码，失败时才解码输出
         result = subprocess.run([
             sys.executable, "-m", "pytest", "tests/", "-v"
-        ], capture_output=True, text=True)
-        
+        ], stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+
         if result.returncode == 0:
             print("✓ All tests passed")
             return True
         else:
-            print(f"✗ Tests failed:\n{result.stdout}\n{result.stderr}")
+            print(f"✗ Tests failed:\n{result.stdout.decode(errors='replace')}")
             return False
             
     except FileNotFoundError:
@@ -108,8 +127,7 @@ def validate_mcp_config():
         return False
     
     try:
-        with open(mcp_file, 'r', encoding='utf-8') as f:
-            config = json.load(f)
+        config = _loads(mcp_file.read_bytes())
         
         # 检查配置结构
         if "mcpServers" not in config:
@@ -119,21 +137,26 @@ def validate_mcp_config():
         print("✓ MCP configuration is valid")
         return True
         
-    except json.JSONDecodeError as e:
+    except ValueError as e:
+        # json.JSONDecodeError与orjson.JSONDecodeError都是ValueError子类
         print(f"✗ Invalid JSON in mcp.json: {e}")
         return False
 
 
+def _walk_files(path):
+    """os.scandir递归遍历文件，复用DirEntry缓存的stat信息"""
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _walk_files(entry.path)
+            elif entry.is_file(follow_symlinks=False):
+                yield entry
+
+
 def create_release_archive():
     """创建发布归档"""
     project_root = get_project_root()
     
-    # 创建 release 目录
-    release_dir = project_root / "release"
-    if release_dir.exists():
-        shutil.rmtree(release_dir)
-    release_dir.mkdir()
-    
     # 要包含的文件和目录
     include_items = [
         "*.py",
@@ -146,36 +169,35 @@ def create_release_archive():
         "tests/"
     ]
     
-    # 复制文件
-    for item in include_items:
-        if item.endswith('/'):
-            # 目录
-            src_dir = project_root / item.rstrip('/')
-            if src_dir.exists():
-                dst_dir = release_dir / item.rstrip('/')
-                shutil.copytree(src_dir, dst_dir)
-                print(f"✓ Copied directory: {item}")
-        else:
-            # 文件或通配符
-            if '*' in item:
-                import glob
-                for file_path in glob.glob(str(project_root / item)):
-                    file_name = os.path.basename(file_path)
-                    shutil.copy2(file_path, release_dir / file_name)
-                    print(f"✓ Copied file: {file_name}")
-            else:
-                src_file = project_root / item
-                if src_file.exists():
-                    shutil.copy2(src_file, release_dir / item)
-                    print(f"✓ Copied file: {item}")
-    
-    # 创建 ZIP 归档
     archive_name = f"surge-analysis-mcp-v{get_current_version()}"
-    shutil.make_archive(
-        str(project_root / archive_name),
-        'zip',
-        str(release_dir)
-    )
+    archive_path = project_root / f"{archive_name}.zip"
+    
+    # 直接从源码树流式写入zip，省去release/目录的整份staging拷贝
+    with zipfile.ZipFile(archive_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+        for item in include_items:
+            if item.endswith('/'):
+                # 目录
+                src_dir = project_root / item.rstrip('/')
+                if src_dir.exists():
+                    for entry in _walk_files(src_dir):
+                        arcname = os.path.relpath(entry.path, project_root)
+                        zf.write(entry.path, arcname)
+                    print(f"✓ Archived directory: {item}")
+            else:
+                # 文件或通配符
+                if '*' in item:
+                    # 通配符只用于根目录的*.py，单次scandir过滤即可
+                    suffix = item.lstrip('*')
+                    with os.scandir(project_root) as it:
+                        for entry in it:
+                            if entry.is_file(follow_symlinks=False) and entry.name.endswith(suffix):
+                                zf.write(entry.path, entry.name)
+                                print(f"✓ Archived file: {entry.name}")
+                else:
+                    src_file = project_root / item
+                    if src_file.exists():
+                        zf.write(src_file, item)
+                        print(f"✓ Archived file: {item}")
     
     print(f"✓ Created release archive: {archive_name}.zip")
     return f"{archive_name}.zip"
@@ -7,10 +7,17 @@ Clean MCP Server for Stock Surge Analysis
 import asyncio
 import sys
 import os
+import time
+import functools
+import hashlib
 from datetime import datetime, timedelta
+from pathlib import Path
 import json
 from typing import Any, Dict, List, Optional
 import pandas as pd
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter, Retry
 import akshare as ak
 
 # 设置编码
@@ -24,6 +31,63 @@ import mcp.server.stdio
 # 创建服务器实例
 server = Server("surge-analysis-server")
 
+# 共享连接池Session：akshare内部走requests.get/post，批量抓取复用
+# keep-alive连接，省去每只股票重复TLS握手
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=16,
+    max_retries=Retry(total=2, backoff_factor=0.3)
+)
+_SESSION.mount("https://", _ADAPTER)
+_SESSION.mount("http://", _ADAPTER)
+requests.get = _SESSION.get
+requests.post = _SESSION.post
+
+# 限制并发akshare请求数，避免触发上游限流
+_FETCH_SEMAPHORE = asyncio.Semaphore(8)
+
+# 单次行情抓取的时间上限，从拿到信号量后起算：排队等并发槽的时间
+# 不计入，慢上游只拖垮自己那只股票，不会连累整批排队的健康股票
+_SYMBOL_TIMEOUT = 8.0
+
+# akshare抓取结果的磁盘缓存：行情缓存1个交易日，公司信息基本静态缓存1周
+_CACHE_DIR = Path.home() / ".cache" / "surge-analysis"
+_HIST_TTL = 86400
+_COMPANY_TTL = 7 * 86400
+
+# 进程内公司信息缓存，避免重复解析
+_COMPANY_CACHE: Dict[str, Dict[str, str]] = {}
+
+
+@functools.lru_cache(maxsize=8)
+def _window_strs(days: int, tick: int):
+    """窗口起止日期串，按分钟滚动缓存：同一分钟内反复分析时
+    跳过重复的strftime，也让磁盘缓存键保持稳定"""
+    end = datetime.now()
+    start = end - timedelta(days=days)
+    return start.strftime("%Y%m%d"), end.strftime("%Y%m%d"), start.strftime("%Y-%m-%d")
+
+
+def _cached_fetch(func, key, ttl, **kwargs):
+    """按key磁盘缓存akshare抓取的DataFrame，TTL内直接读取"""
+    digest = hashlib.md5(key.encode()).hexdigest()
+    path = _CACHE_DIR / f"{digest}.pkl"
+
+    if path.exists() and time.time() - path.stat().st_mtime < ttl:
+        try:
+            return pd.read_pickle(path)
+        except Exception:
+            pass  # 缓存损坏时重新抓取
+
+    df = func(**kwargs)
+    try:
+        _CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        df.to_pickle(path)
+    except Exception:
+        pass  # 缓存写失败不影响正常返回
+    return df
+
 # 预设股票列表
 POPULAR_STOCKS = [
     ["000001", "平安银行"],
@@ -48,74 +112,196 @@ class CleanSurgeAnalyzer:
     def __init__(self):
         self.surge_threshold = 5.0
         self.volume_threshold = 2.0
+        # 进程内按股票记忆已取的最长窗口行情，短窗口请求直接切片
+        self._hist_cache: Dict[str, tuple] = {}
+        # 并发扇出时同一股票的在途抓取，后到协程等待首个结果
+        self._hist_inflight: Dict[str, asyncio.Future] = {}
+        # 预处理后的numpy数组缓存，按(symbol, 末日, 行数)自然失效
+        self._prep_cache: Dict[tuple, tuple] = {}
+        
+    async def _get_hist(self, symbol: str, days: int):
+        """获取历史行情：总是取到该股票迄今请求过的最长窗口并记忆，
+        更短的窗口从内存切片返回，混合调用不同days时只抓一次"""
+        tick = int(time.time()) // 60
+        _, end_str, cutoff = _window_strs(days, tick)
+
+        cached = self._hist_cache.get(symbol)
+        if cached is not None:
+            cached_days, cached_end, df = cached
+            if cached_days >= days and cached_end == end_str:
+                return df[df['日期'] >= cutoff]
+
+        # 合并在途请求：批量/对比扇出遇到重复股票时只发一次HTTP，
+        # 其余协程等待后直接复用内存缓存
+        inflight = self._hist_inflight.get(symbol)
+        if inflight is not None:
+            await inflight
+            cached = self._hist_cache.get(symbol)
+            if cached is not None and cached[0] >= days and cached[1] == end_str:
+                return cached[2][cached[2]['日期'] >= cutoff]
+            # 在途结果窗口不足（或失败），照常自行抓取
+
+        fut = asyncio.get_running_loop().create_future()
+        self._hist_inflight[symbol] = fut
+        try:
+            fetch_days = max(days, cached[0] if cached else 0)
+            start_str = _window_strs(fetch_days, tick)[0]
+            async with _FETCH_SEMAPHORE:
+                # 超时只罩住抓取本身（信号量获取后起算），排队时间不占预算
+                hist_df = await asyncio.wait_for(
+                    asyncio.to_thread(
+                        _cached_fetch,
+                        ak.stock_zh_a_hist,
+                        f"hist:{symbol}:{start_str}:{end_str}:qfq",
+                        _HIST_TTL,
+                        symbol=symbol,
+                        period="daily",
+                        start_date=start_str,
+                        end_date=end_str,
+                        adjust="qfq"
+                    ),
+                    timeout=_SYMBOL_TIMEOUT
+                )
+
+            if not hist_df.empty:
+                # akshare返回的日期列是datetime.date对象，入缓存前统一
+                # 转成YYYY-MM-DD字符串：后面的cutoff切片和排序守卫都按
+                # 字典序即时间序比较，直接拿date对象比字符串会抛TypeError
+                hist_df['日期'] = hist_df['日期'].astype(str)
+                self._hist_cache[symbol] = (fetch_days, end_str, hist_df)
+        finally:
+            self._hist_inflight.pop(symbol, None)
+            fut.set_result(None)
+
+        if fetch_days > days:
+            return hist_df[hist_df['日期'] >= cutoff]
+        return hist_df
         
-    async def analyze_stock(self, symbol: str, name: str = None, days: int = 180):
+    async def analyze_stock(self, symbol: str, name: str = None, days: int = 180,
+                            surge_threshold: float = None, *,
+                            fetch_company: bool = True):
         """Analyze stock surge patterns"""
+        if surge_threshold is None:
+            surge_threshold = self.surge_threshold
         try:
-            # Get stock data
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=days)
-            
-            hist_df = ak.stock_zh_a_hist(
-                symbol=symbol,
-                period="daily", 
-                start_date=start_date.strftime("%Y%m%d"),
-                end_date=end_date.strftime("%Y%m%d"),
-                adjust="qfq"
-            )
+            # Get stock data（akshare阻塞调用在_get_hist里进线程池，
+            # 并带磁盘+进程内双层缓存）
+            hist_df = await self._get_hist(symbol, days)
             
             if hist_df.empty:
                 return None
-            
-            # Data preprocessing
-            hist_df['日期'] = pd.to_datetime(hist_df['日期'])
-            hist_df = hist_df.sort_values('日期')
-            hist_df['涨跌幅'] = hist_df['收盘'].pct_change() * 100
+
+            # 不足两根K线算不出涨跌幅（新股/长期停牌），直接放弃，
+            # 也免得再为它发一次公司信息请求
+            if len(hist_df) < 2:
+                return None
+
+            # Data preprocessing：日期列在_get_hist入缓存时已统一成
+            # YYYY-MM-DD字符串（akshare原始返回的是datetime.date对象），
+            # 字典序即时间序，免去to_datetime解析再strftime回转的整列
+            # 往返，仅在乱序时才排序
+            if not hist_df['日期'].is_monotonic_increasing:
+                hist_df = hist_df.sort_values('日期')
+
+            dates = hist_df['日期'].values
+
+            # 预处理数组按(symbol, 末日, 行数)缓存：同一交易日内重复
+            # 分析相同窗口只剩掩码和聚合这些轻量ufunc，新交易日落地
+            # 后键自然失效
+            prep_key = (symbol, str(dates[-1]), len(dates))
+            prep = self._prep_cache.get(prep_key)
+            if prep is None:
+                # 只抽取用到的两列为连续数组并降精度（float32/int32
+                # 对日线行情绰绰有余），单趟numpy算涨跌幅，
+                # 省掉pct_change的Series/索引开销
+                close = hist_df['收盘'].to_numpy(dtype=np.float32)
+                vols = hist_df['成交量'].to_numpy(dtype=np.int32)
+                rets = np.empty_like(close)
+                rets[0] = np.nan
+                np.divide(close[1:], close[:-1], out=rets[1:])
+                rets[1:] -= 1.0
+                rets *= 100.0
+                prep = (close, vols, rets)
+                self._prep_cache[prep_key] = prep
+            close, vols, rets = prep
             
             # Basic statistics
             basic_stats = {
-                'current_price': float(hist_df['收盘'].iloc[-1]),
-                'total_return': float(((hist_df['收盘'].iloc[-1] / hist_df['收盘'].iloc[0]) - 1) * 100),
-                'volatility': float(hist_df['涨跌幅'].std()),
-                'min_price': float(hist_df['收盘'].min()),
-                'max_price': float(hist_df['收盘'].max())
+                'current_price': float(close[-1]),
+                'total_return': float((close[-1] / close[0] - 1) * 100),
+                'volatility': float(np.nanstd(rets, ddof=1)),
+                'min_price': float(close.min()),
+                'max_price': float(close.max())
             }
             
-            # Surge analysis
-            surge_days = hist_df[hist_df['涨跌幅'] > self.surge_threshold].copy()
-            surges = []
-            for _, row in surge_days.iterrows():
-                surges.append({
-                    'date': row['日期'].strftime('%Y-%m-%d'),
-                    'return': float(row['涨跌幅']),
-                    'volume': int(row['成交量']),
-                    'price': float(row['收盘'])
-                })
-            
-            # Sort by date descending
-            surges = sorted(surges, key=lambda x: x['date'], reverse=True)
+            # Surge analysis：涨跌幅保持纯numpy数组，不回写DataFrame列
+            # （回写会多一次整列拷贝和BlockManager整理，下游只用掩码）。
+            # hist_df已按日期升序，掩码切片天然有序，倒排切片即得日期降序，
+            # 无需再做Python级sorted。
+            surge_mask = rets > surge_threshold
+            surge_dates = dates[surge_mask][::-1]
+            surge_rets = rets[surge_mask][::-1]
+            surge_vols = vols[surge_mask][::-1]
+            surge_prices = close[surge_mask][::-1]
             
-            # Volume analysis
-            avg_volume = hist_df['成交量'].mean()
-            volume_spikes = hist_df[hist_df['成交量'] > avg_volume * self.volume_threshold]
+            surges = [
+                {
+                    'date': str(d),
+                    'return': float(r),
+                    'volume': int(v),
+                    'price': float(p)
+                }
+                for d, r, v, p in zip(surge_dates, surge_rets, surge_vols, surge_prices)
+            ]
             
+            # Volume analysis：放量天数只需掩码求和，
+            # 不必切出整个过滤后的DataFrame
+            avg_volume = vols.mean()
+
             volume_stats = {
                 'avg_volume': int(avg_volume),
-                'max_volume': int(hist_df['成交量'].max()),
-                'spikes': len(volume_spikes)
+                'max_volume': int(vols.max()),
+                'spikes': int((vols > avg_volume * self.volume_threshold).sum())
             }
             
-            # Company info
-            try:
-                company_info = ak.stock_individual_info_em(symbol=symbol)
+            # Company info：摘要/对比/批量工具不展示公司信息，
+            # 按需跳过这轮RPC，省掉每只股票的第二次网络往返
+            company_data = {}
+            if fetch_company:
+                company_data = _COMPANY_CACHE.get(symbol)
+            if fetch_company and company_data is None:
+                # 只对网络瞬断做指数退避重试，别的异常不再被裸except
+                # 一概吞掉；失败不写缓存，下次调用还有机会补上
+                company_info = None
+                for attempt in range(3):
+                    try:
+                        async with _FETCH_SEMAPHORE:
+                            company_info = await asyncio.to_thread(
+                                _cached_fetch,
+                                ak.stock_individual_info_em,
+                                f"info:{symbol}",
+                                _COMPANY_TTL,
+                                symbol=symbol
+                            )
+                        break
+                    except (requests.ConnectionError, requests.Timeout):
+                        await asyncio.sleep(0.2 * 2 ** attempt)
+                    except Exception:
+                        break  # akshare接口变动等硬错误，不值得重试
+
                 company_data = {}
-                if not company_info.empty:
-                    for _, row in company_info.iterrows():
-                        key = str(row['item']).strip()
-                        value = str(row['value']).strip()
-                        if key and value and key != 'nan' and value != 'nan':
-                            company_data[key] = value
-            except:
+                if company_info is not None and not company_info.empty:
+                    # 字符串清洗整列向量化，Python侧只剩一次dict(zip)
+                    items = company_info['item'].astype('string').str.strip()
+                    values = company_info['value'].astype('string').str.strip()
+                    mask = (
+                        items.notna() & values.notna()
+                        & (items != '') & (values != '')
+                    )
+                    company_data = dict(zip(items[mask], values[mask]))
+                if company_info is not None:
+                    _COMPANY_CACHE[symbol] = company_data
+            if company_data is None:
                 company_data = {}
             
             return {
@@ -129,239 +315,317 @@ class CleanSurgeAnalyzer:
             return None
 
 
-@server.list_tools()
-async def handle_list_tools() -> list[types.Tool]:
-    """List available tools"""
-    return [
-        types.Tool(
-            name="analyze_single_stock",
-            description="分析单只股票的暴涨逻辑和技术指标",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "symbol": {
-                        "type": "string",
-                        "description": "股票代码，如 000158"
-                    },
-                    "name": {
-                        "type": "string",
-                        "description": "股票名称（可选）"
-                    },
-                    "days": {
-                        "type": "integer",
-                        "description": "分析天数，默认180天",
-                        "default": 180
-                    }
+# 分析器无会话状态、阈值可按调用传入，进程内共享一个实例即可
+_ANALYZER = CleanSurgeAnalyzer()
+
+
+# 工具schema是静态的，启动时构建一次，list_tools直接返回
+_TOOLS = [
+types.Tool(
+        name="analyze_single_stock",
+        description="分析单只股票的暴涨逻辑和技术指标",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "symbol": {
+                    "type": "string",
+                    "description": "股票代码，如 000158"
                 },
-                "required": ["symbol"]
-            }
-        ),
-        types.Tool(
-            name="get_surge_summary",
-            description="获取股票暴涨事件摘要信息",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "symbol": {
-                        "type": "string",
-                        "description": "股票代码"
-                    },
-                    "name": {
-                        "type": "string",
-                        "description": "股票名称（可选）"
-                    },
-                    "surge_threshold": {
-                        "type": "number",
-                        "description": "暴涨阈值（百分比），默认5.0",
-                        "default": 5.0
-                    }
+                "name": {
+                    "type": "string",
+                    "description": "股票名称（可选）"
                 },
-                "required": ["symbol"]
-            }
-        ),
-        types.Tool(
-            name="compare_stocks",
-            description="对比分析两只或多只股票的表现",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "stocks": {
+                "days": {
+                    "type": "integer",
+                    "description": "分析天数，默认180天",
+                    "default": 180
+                }
+            },
+            "required": ["symbol"]
+        }
+    ),
+    types.Tool(
+        name="get_surge_summary",
+        description="获取股票暴涨事件摘要信息",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "symbol": {
+                    "type": "string",
+                    "description": "股票代码"
+                },
+                "name": {
+                    "type": "string",
+                    "description": "股票名称（可选）"
+                },
+                "surge_threshold": {
+                    "type": "number",
+                    "description": "暴涨阈值（百分比），默认5.0",
+                    "default": 5.0
+                }
+            },
+            "required": ["symbol"]
+        }
+    ),
+    types.Tool(
+        name="compare_stocks",
+        description="对比分析两只或多只股票的表现",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "stocks": {
+                    "type": "array",
+                    "items": {
                         "type": "array",
-                        "items": {
-                            "type": "array",
-                            "items": {"type": "string"},
-                            "minItems": 2,
-                            "maxItems": 2
-                        },
-                        "description": "股票列表，格式：[["代码", "名称"], ...]",
-                        "minItems": 2
+                        "items": {"type": "string"},
+                        "minItems": 2,
+                        "maxItems": 2
                     },
-                    "days": {
-                        "type": "integer",
-                        "description": "分析天数，默认180天",
-                        "default": 180
-                    }
+                    "description": "股票列表，格式：[['代码', '名称'], ...]",
+                    "minItems": 2
                 },
-                "required": ["stocks"]
-            }
-        ),
-        types.Tool(
-            name="batch_analyze_stocks",
-            description="批量分析股票组合",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "preset": {
-                        "type": "string",
-                        "description": "预设组合：popular（热门股）或 tech（科技股）",
-                        "enum": ["popular", "tech"]
-                    },
-                    "stocks": {
+                "days": {
+                    "type": "integer",
+                    "description": "分析天数，默认180天",
+                    "default": 180
+                }
+            },
+            "required": ["stocks"]
+        }
+    ),
+    types.Tool(
+        name="batch_analyze_stocks",
+        description="批量分析股票组合",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "preset": {
+                    "type": "string",
+                    "description": "预设组合：popular（热门股）或 tech（科技股）",
+                    "enum": ["popular", "tech"]
+                },
+                "stocks": {
+                    "type": "array",
+                    "items": {
                         "type": "array",
-                        "items": {
-                            "type": "array",
-                            "items": {"type": "string"},
-                            "minItems": 2,
-                            "maxItems": 2
-                        },
-                        "description": "自定义股票列表"
+                        "items": {"type": "string"},
+                        "minItems": 2,
+                        "maxItems": 2
                     },
-                    "days": {
-                        "type": "integer",
-                        "description": "分析天数，默认180天",
-                        "default": 180
-                    }
+                    "description": "自定义股票列表"
+                },
+                "days": {
+                    "type": "integer",
+                    "description": "分析天数，默认180天",
+                    "default": 180
                 }
             }
-        )
-    ]
+        }
+    )
+]
+
+
+@server.list_tools()
+async def handle_list_tools() -> list[types.Tool]:
+    """List available tools"""
+    return _TOOLS
+
 
 
 @server.call_tool()
 async def handle_call_tool(name: str, arguments: dict) -> list[types.TextContent]:
     """Handle tool calls"""
-    analyzer = CleanSurgeAnalyzer()
-    
     if name == "analyze_single_stock":
-        symbol = arguments.get("symbol")
-        name = arguments.get("name", symbol)
-        days = arguments.get("days", 180)
+        return await _analyze_single_stock(arguments)
+    elif name == "get_surge_summary":
+        return await _get_surge_summary(arguments)
+    elif name == "compare_stocks":
+        return await _compare_stocks(arguments)
+    elif name == "batch_analyze_stocks":
+        return await _batch_analyze_stocks(arguments)
+    
+    return [types.TextContent(type="text", text="未知工具")]
+
+
+async def _analyze_single_stock(arguments: dict) -> list[types.TextContent]:
+    """分析单只股票，返回文本报告和结构化指标"""
+    analyzer = _ANALYZER
+    symbol = arguments.get("symbol")
+    name = arguments.get("name", symbol)
+    days = arguments.get("days", 180)
+    
+    result = await analyzer.analyze_stock(symbol, name, days)
+    if result:
+        # 拼接用列表+join，避免逐次字符串重分配
+        parts = [
+            f"股票分析：{name} ({symbol})\n",
+            "=" * 50 + "\n",
+            f"当前价格：{result['basic']['current_price']:.2f}\n",
+            f"总回报率：{result['basic']['total_return']:.2f}%\n",
+            f"波动率：{result['basic']['volatility']:.2f}%\n",
+            f"价格区间：{result['basic']['min_price']:.2f} - {result['basic']['max_price']:.2f}\n",
+            f"暴涨次数：{len(result['surges'])}\n"
+        ]
         
-        result = await analyzer.analyze_stock(symbol, name, days)
-        if result:
-            report = f"股票分析：{name} ({symbol})\n"
-            report += "=" * 50 + "\n"
-            report += f"当前价格：{result['basic']['current_price']:.2f}\n"
-            report += f"总回报率：{result['basic']['total_return']:.2f}%\n"
-            report += f"波动率：{result['basic']['volatility']:.2f}%\n"
-            report += f"价格区间：{result['basic']['min_price']:.2f} - {result['basic']['max_price']:.2f}\n"
-            report += f"暴涨次数：{len(result['surges'])}\n"
-            
-            if result['surges']:
-                report += "\n最近暴涨事件：\n"
-                for surge in result['surges'][:3]:
-                    report += f"  {surge['date']}: {surge['return']:.2f}% (成交量: {surge['volume']})\n"
-            
-            return [types.TextContent(type="text", text=report)]
-        else:
-            return [types.TextContent(type="text", text=f"无法获取 {symbol} 的数据，请检查股票代码是否正确")]
+        if result['surges']:
+            parts.append("\n最近暴涨事件：\n")
+            for surge in result['surges'][:3]:
+                parts.append(f"  {surge['date']}: {surge['return']:.2f}% (成交量: {surge['volume']})\n")
+        
+        report = "".join(parts)
+        
+        # 附带结构化指标，调用方无需解析文本
+        metrics = {
+            "symbol": symbol,
+            "total_return": result['basic']['total_return'],
+            "volatility": result['basic']['volatility'],
+            "surge_count": len(result['surges'])
+        }
+        return [
+            types.TextContent(type="text", text=report),
+            types.TextContent(type="text", text=json.dumps(metrics, ensure_ascii=False))
+        ]
+    else:
+        return [types.TextContent(type="text", text=f"无法获取 {symbol} 的数据，请检查股票代码是否正确")]
+
+
+async def _get_surge_summary(arguments: dict) -> list[types.TextContent]:
+    """获取股票暴涨事件摘要"""
+    analyzer = _ANALYZER
+    symbol = arguments.get("symbol")
+    name = arguments.get("name", symbol)
+    threshold = arguments.get("surge_threshold", 5.0)
     
-    elif name == "get_surge_summary":
-        symbol = arguments.get("symbol")
-        name = arguments.get("name", symbol)
-        threshold = arguments.get("surge_threshold", 5.0)
+    # 使用分析器获取数据，按调用方的阈值检测暴涨
+    result = await analyzer.analyze_stock(symbol, name, 360, surge_threshold=threshold,
+                                          fetch_company=False)  # 1年数据
+    if result:
+        surges = [s for s in result['surges'] if s['return'] >= threshold]
         
-        # 使用分析器获取数据
-        result = await analyzer.analyze_stock(symbol, name, 360)  # 1年数据
-        if result:
-            surges = [s for s in result['surges'] if s['return'] >= threshold]
-            
-            report = f"暴涨摘要：{name} ({symbol})\n"
-            report += "=" * 40 + "\n"
-            report += f"暴涨阈值：{threshold}%\n"
-            report += f"暴涨次数：{len(surges)}\n"
-            
-            if surges:
-                report += f"最大单日涨幅：{max(s['return'] for s in surges):.2f}%\n"
-                report += f"平均暴涨幅度：{sum(s['return'] for s in surges)/len(surges):.2f}%\n"
-                
-                report += "\n最近暴涨事件：\n"
-                for surge in surges[:5]:
-                    report += f"  {surge['date']}: {surge['return']:.2f}%\n"
+        parts = [
+            f"暴涨摘要：{name} ({symbol})\n",
+            "=" * 40 + "\n",
+            f"暴涨阈值：{threshold}%\n",
+            f"暴涨次数：{len(surges)}\n"
+        ]
+        
+        if surges:
+            parts.append(f"最大单日涨幅：{max(s['return'] for s in surges):.2f}%\n")
+            parts.append(f"平均暴涨幅度：{sum(s['return'] for s in surges)/len(surges):.2f}%\n")
             
-            return [types.TextContent(type="text", text=report)]
-        else:
-            return [types.TextContent(type="text", text=f"无法获取 {symbol} 的数据")]
+            parts.append("\n最近暴涨事件：\n")
+            for surge in surges[:5]:
+                parts.append(f"  {surge['date']}: {surge['return']:.2f}%\n")
+        
+        return [types.TextContent(type="text", text="".join(parts))]
+    else:
+        return [types.TextContent(type="text", text=f"无法获取 {symbol} 的数据")]
+
+
+async def _compare_stocks(arguments: dict) -> list[types.TextContent]:
+    """对比分析多只股票"""
+    analyzer = _ANALYZER
+    stocks = arguments.get("stocks", [])
+    days = arguments.get("days", 180)
     
-    elif name == "compare_stocks":
-        stocks = arguments.get("stocks", [])
-        days = arguments.get("days", 180)
+    # 并发抓取全部股票（对比展示不含公司信息，跳过该RPC）
+    tasks = [analyzer.analyze_stock(stock[0], stock[1], days, fetch_company=False)
+             for stock in stocks]
+    raw_results = await asyncio.gather(*tasks, return_exceptions=True)
+    
+    comparison = []
+    for stock, result in zip(stocks, raw_results):
+        if result and not isinstance(result, Exception):
+            comparison.append({
+                'symbol': stock[0],
+                'name': stock[1],
+                'data': result
+            })
+    
+    if comparison:
+        parts = ["股票对比分析\n", "=" * 50 + "\n"]
         
-        comparison = []
-        for stock in stocks:
-            symbol, name = stock[0], stock[1]
-            result = await analyzer.analyze_stock(symbol, name, days)
-            if result:
-                comparison.append({
-                    'symbol': symbol,
-                    'name': name,
-                    'data': result
-                })
+        for item in comparison:
+            data = item['data']
+            parts.append(f"\n{item['name']} ({item['symbol']}):\n")
+            parts.append(f"  总回报率：{data['basic']['total_return']:.2f}%\n")
+            parts.append(f"  波动率：{data['basic']['volatility']:.2f}%\n")
+            parts.append(f"  暴涨次数：{len(data['surges'])}\n")
         
-        if comparison:
-            report = "股票对比分析\n"
-            report += "=" * 50 + "\n"
-            
-            for item in comparison:
-                data = item['data']
-                report += f"\n{item['name']} ({item['symbol']}):\n"
-                report += f"  总回报率：{data['basic']['total_return']:.2f}%\n"
-                report += f"  波动率：{data['basic']['volatility']:.2f}%\n"
-                report += f"  暴涨次数：{len(data['surges'])}\n"
-            
-            return [types.TextContent(type="text", text=report)]
-        else:
-            return [types.TextContent(type="text", text="无法获取对比数据")]
+        return [types.TextContent(type="text", text="".join(parts))]
+    else:
+        return [types.TextContent(type="text", text="无法获取对比数据")]
+
+
+async def _batch_analyze_stocks(arguments: dict) -> list[types.TextContent]:
+    """批量分析股票组合"""
+    analyzer = _ANALYZER
+    preset = arguments.get("preset")
+    custom_stocks = arguments.get("stocks", [])
+    days = arguments.get("days", 180)
     
-    elif name == "batch_analyze_stocks":
-        preset = arguments.get("preset")
-        custom_stocks = arguments.get("stocks", [])
-        days = arguments.get("days", 180)
+    if preset == "popular":
+        stocks = POPULAR_STOCKS
+    elif preset == "tech":
+        stocks = TECH_STOCKS
+    else:
+        stocks = custom_stocks
+
+    # 按代码去重（保留首次出现的名称），重复股票不重复发请求
+    unique_stocks = {}
+    for symbol, stock_name in stocks:
+        unique_stocks.setdefault(symbol, stock_name)
+    stocks = list(unique_stocks.items())
+
+    # 并发抓取全部股票（批量展示不含公司信息，跳过该RPC）。
+    # 单只抓取的超时在_get_hist内部、拿到信号量后才起算，
+    # 排队等并发槽的健康股票不会被整只超时掉
+    tasks = [
+        analyzer.analyze_stock(stock[0], stock[1], days, fetch_company=False)
+        for stock in stocks
+    ]
+    raw_results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    results = []
+    for stock, result in zip(stocks, raw_results):
+        if result and not isinstance(result, Exception):
+            results.append({
+                'symbol': stock[0],
+                'name': stock[1],
+                'data': result
+            })
+    
+    if results:
+        parts = [f"批量分析结果 ({preset or '自定义'})\n", "=" * 50 + "\n"]
         
-        if preset == "popular":
-            stocks = POPULAR_STOCKS
-        elif preset == "tech":
-            stocks = TECH_STOCKS
-        else:
-            stocks = custom_stocks
+        for item in results:
+            data = item['data']
+            parts.append(f"\n{item['name']} ({item['symbol']}):\n")
+            parts.append(f"  总回报率：{data['basic']['total_return']:.2f}%\n")
+            parts.append(f"  波动率：{data['basic']['volatility']:.2f}%\n")
+            parts.append(f"  暴涨次数：{len(data['surges'])}\n")
         
-        results = []
-        for stock in stocks:
-            symbol, name = stock[0], stock[1]
-            result = await analyzer.analyze_stock(symbol, name, days)
-            if result:
-                results.append({
-                    'symbol': symbol,
-                    'name': name,
-                    'data': result
-                })
+        report = "".join(parts)
         
-        if results:
-            report = f"批量分析结果 ({preset or '自定义'})\n"
-            report += "=" * 50 + "\n"
-            
-            for item in results:
-                data = item['data']
-                report += f"\n{item['name']} ({item['symbol']}):\n"
-                report += f"  总回报率：{data['basic']['total_return']:.2f}%\n"
-                report += f"  波动率：{data['basic']['volatility']:.2f}%\n"
-                report += f"  暴涨次数：{len(data['surges'])}\n"
-            
-            return [types.TextContent(type="text", text=report)]
-        else:
-            return [types.TextContent(type="text", text="批量分析失败")]
-    
-    return [types.TextContent(type="text", text="未知工具")]
+        # 附带结构化的组合指标
+        payload = {
+            "stocks": [
+                {
+                    "symbol": item['symbol'],
+                    "name": item['name'],
+                    "total_return": item['data']['basic']['total_return'],
+                    "volatility": item['data']['basic']['volatility'],
+                    "surge_count": len(item['data']['surges'])
+                }
+                for item in results
+            ]
+        }
+        return [
+            types.TextContent(type="text", text=report),
+            types.TextContent(type="text", text=json.dumps(payload, ensure_ascii=False))
+        ]
+    else:
+        return [types.TextContent(type="text", text="批量分析失败")]
 
 
 async def main():
@@ -380,4 +644,11 @@ async def main():
 
 
 if __name__ == "__main__":
+    # uvloop为可选加速依赖（仅POSIX），装上后事件循环调度开销更低
+    if sys.platform != 'win32':
+        try:
+            import uvloop
+            uvloop.install()
+        except ImportError:
+            pass
     asyncio.run(main())
\ No newline at end of file
@@ -15,7 +15,14 @@ import time
 # 添加当前目录到Python路径
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from surge_analysis_mcp_server import analyze_single_stock, get_surge_summary, compare_stocks, batch_analyze_stocks
+# 直接调用服务器的工具处理函数（dict入参，返回TextContent列表），
+# 与handle_call_tool分发到的是同一批实现
+from surge_analysis_mcp_server import (
+    _analyze_single_stock,
+    _get_surge_summary,
+    _compare_stocks,
+    _batch_analyze_stocks,
+)
 
 
 class MCPServerTester:
@@ -60,50 +67,56 @@ class MCPServerTester:
             {"symbol": "300750", "name": "宁德时代", "days": 30}
         ]
         
-        for case in test_cases:
-            try:
-                print(f"测试 {case['name']}({case['symbol']})...")
-                
-                result = await analyze_single_stock(
-                    symbol=case['symbol'],
-                    name=case['name'],
-                    days=case['days']
-                )
-                
-                if result:
-                    self.test_results.append({
-                        "test": "single_stock",
-                        "symbol": case['symbol'],
-                        "name": case['name'],
-                        "status": "PASS",
-                        "data_points": len(result.get('basic', {}).get('data', [])),
-                        "surge_count": len(result.get('surges', [])),
-                        "volume_spikes": len(result.get('volume', {}).get('spikes', [])),
-                        "error": None
-                    })
-                    print(f"✅ {case['name']} 分析成功")
-                    print(f"   数据点: {len(result.get('basic', {}).get('data', []))}")
-                    print(f"   暴涨次数: {len(result.get('surges', []))}")
-                    print(f"   成交量异常: {len(result.get('volume', {}).get('spikes', []))}")
-                else:
-                    self.test_results.append({
-                        "test": "single_stock",
-                        "symbol": case['symbol'],
-                        "name": case['name'],
-                        "status": "FAIL",
-                        "error": "返回空数据"
-                    })
-                    print(f"❌ {case['name']} 分析失败: 返回空数据")
-                    
-            except Exception as e:
+        # 三个用例互不依赖，并发执行，总耗时取决于最慢的一个
+        coros = [
+            _analyze_single_stock({
+                "symbol": case['symbol'],
+                "name": case['name'],
+                "days": case['days']
+            })
+            for case in test_cases
+        ]
+        results = await asyncio.gather(*coros, return_exceptions=True)
+
+        for case, result in zip(test_cases, results):
+            print(f"测试 {case['name']}({case['symbol']})...")
+
+            if isinstance(result, Exception):
                 self.test_results.append({
                     "test": "single_stock",
                     "symbol": case['symbol'],
                     "name": case['name'],
                     "status": "ERROR",
-                    "error": str(e)
+                    "error": str(result)
+                })
+                print(f"❌ {case['name']} 分析出错: {result}")
+            elif result and len(result) > 1:
+                # 成功时第二段是结构化指标JSON
+                metrics = json.loads(result[-1].text)
+                self.test_results.append({
+                    "test": "single_stock",
+                    "symbol": case['symbol'],
+                    "name": case['name'],
+                    "status": "PASS",
+                    "total_return": metrics.get('total_return'),
+                    "volatility": metrics.get('volatility'),
+                    "surge_count": metrics.get('surge_count'),
+                    "error": None
                 })
-                print(f"❌ {case['name']} 分析出错: {e}")
+                print(f"✅ {case['name']} 分析成功")
+                print(f"   总回报率: {metrics.get('total_return', 0):.2f}%")
+                print(f"   波动率: {metrics.get('volatility', 0):.2f}%")
+                print(f"   暴涨次数: {metrics.get('surge_count', 0)}")
+            else:
+                error_text = result[0].text if result else "返回空数据"
+                self.test_results.append({
+                    "test": "single_stock",
+                    "symbol": case['symbol'],
+                    "name": case['name'],
+                    "status": "FAIL",
+                    "error": error_text
+                })
+                print(f"❌ {case['name']} 分析失败: {error_text}")
     
     async def test_surge_summary(self):
         """测试暴涨摘要功能"""
@@ -115,48 +128,39 @@ class MCPServerTester:
             {"symbol": "300750", "name": "宁德时代"}
         ]
         
-        try:
-            result = await get_surge_summary(
-                symbols=test_symbols,
-                days=180
-            )
-            
-            if result:
+        # 摘要工具按单只股票调用，多只并发执行
+        coros = [
+            _get_surge_summary({"symbol": s['symbol'], "name": s['name']})
+            for s in test_symbols
+        ]
+        results = await asyncio.gather(*coros, return_exceptions=True)
+
+        for s, result in zip(test_symbols, results):
+            if isinstance(result, Exception):
                 self.test_results.append({
                     "test": "surge_summary",
-                    "symbols": [s['symbol'] for s in test_symbols],
+                    "symbol": s['symbol'],
+                    "status": "ERROR",
+                    "error": str(result)
+                })
+                print(f"❌ {s['name']} 暴涨摘要出错: {result}")
+            elif result and not result[0].text.startswith("无法获取"):
+                self.test_results.append({
+                    "test": "surge_summary",
+                    "symbol": s['symbol'],
                     "status": "PASS",
-                    "total_stocks": len(result.get('stocks', [])),
-                    "total_surges": result.get('summary', {}).get('total_surges', 0),
+                    "report_lines": result[0].text.count("\n"),
                     "error": None
                 })
-                print(f"✅ 暴涨摘要生成成功")
-                print(f"   分析股票数: {len(result.get('stocks', []))}")
-                print(f"   总暴涨次数: {result.get('summary', {}).get('total_surges', 0)}")
-                
-                # 显示摘要信息
-                if result.get('summary'):
-                    summary = result['summary']
-                    print(f"   平均涨幅: {summary.get('avg_return', 0):+.1f}%")
-                    print(f"   最大涨幅: {summary.get('max_return', 0):+.1f}%")
-                    print(f"   平均持续时间: {summary.get('avg_duration', 0):.1f}天")
+                print(f"✅ {s['name']} 暴涨摘要生成成功")
             else:
                 self.test_results.append({
                     "test": "surge_summary",
-                    "symbols": [s['symbol'] for s in test_symbols],
+                    "symbol": s['symbol'],
                     "status": "FAIL",
-                    "error": "返回空数据"
+                    "error": result[0].text if result else "返回空数据"
                 })
-                print(f"❌ 暴涨摘要生成失败")
-                
-        except Exception as e:
-            self.test_results.append({
-                "test": "surge_summary",
-                "symbols": [s['symbol'] for s in test_symbols],
-                "status": "ERROR",
-                "error": str(e)
-            })
-            print(f"❌ 暴涨摘要出错: {e}")
+                print(f"❌ {s['name']} 暴涨摘要生成失败")
     
     async def test_stock_comparison(self):
         """测试股票对比功能"""
@@ -170,38 +174,30 @@ class MCPServerTester:
         ]
         
         try:
-            result = await compare_stocks(
-                symbols=test_symbols,
-                days=180
-            )
-            
-            if result:
+            result = await _compare_stocks({
+                "stocks": [[s['symbol'], s['name']] for s in test_symbols],
+                "days": 180
+            })
+
+            if result and not result[0].text.startswith("无法获取"):
                 self.test_results.append({
                     "test": "stock_comparison",
                     "symbols": [s['symbol'] for s in test_symbols],
                     "status": "PASS",
-                    "comparison_count": len(result.get('comparisons', [])),
-                    "rankings": len(result.get('rankings', [])),
+                    "report_lines": result[0].text.count("\n"),
                     "error": None
                 })
                 print(f"✅ 股票对比成功")
-                print(f"   对比组合数: {len(result.get('comparisons', []))}")
-                print(f"   排名项目: {len(result.get('rankings', []))}")
-                
-                # 显示排名信息
-                if result.get('rankings'):
-                    rankings = result['rankings']
-                    for ranking in rankings:
-                        print(f"   {ranking['metric']}: {ranking['leader']['name']} ({ranking['leader']['value']:.1f})")
+                print(f"   对比股票数: {len(test_symbols)}")
             else:
                 self.test_results.append({
                     "test": "stock_comparison",
                     "symbols": [s['symbol'] for s in test_symbols],
                     "status": "FAIL",
-                    "error": "返回空数据"
+                    "error": result[0].text if result else "返回空数据"
                 })
                 print(f"❌ 股票对比失败")
-                
+
         except Exception as e:
             self.test_results.append({
                 "test": "stock_comparison",
@@ -225,39 +221,38 @@ class MCPServerTester:
         ]
         
         try:
-            result = await batch_analyze_stocks(
-                symbols=test_symbols,
-                days=90
-            )
-            
-            if result:
+            result = await _batch_analyze_stocks({
+                "stocks": [[s['symbol'], s['name']] for s in test_symbols],
+                "days": 90
+            })
+
+            if result and len(result) > 1:
+                # 成功时第二段是结构化的组合指标JSON
+                payload = json.loads(result[-1].text)
+                stocks = payload.get('stocks', [])
                 self.test_results.append({
                     "test": "batch_analysis",
                     "symbols": [s['symbol'] for s in test_symbols],
                     "status": "PASS",
-                    "total_stocks": len(result.get('stocks', [])),
-                    "summary_data": len(result.get('summary', {})),
+                    "total_stocks": len(stocks),
                     "error": None
                 })
                 print(f"✅ 批量分析成功")
-                print(f"   分析股票数: {len(result.get('stocks', []))}")
-                print(f"   汇总信息: {len(result.get('summary', {}))}项")
-                
-                # 显示汇总信息
-                summary = result.get('summary', {})
-                if summary:
-                    print(f"   平均收益率: {summary.get('avg_return', 0):+.1f}%")
-                    print(f"   平均波动率: {summary.get('avg_volatility', 0):.1f}%")
-                    print(f"   总暴涨次数: {summary.get('total_surges', 0)}")
+                print(f"   分析股票数: {len(stocks)}")
+                if stocks:
+                    avg_return = sum(s['total_return'] for s in stocks) / len(stocks)
+                    total_surges = sum(s['surge_count'] for s in stocks)
+                    print(f"   平均收益率: {avg_return:+.1f}%")
+                    print(f"   总暴涨次数: {total_surges}")
             else:
                 self.test_results.append({
                     "test": "batch_analysis",
                     "symbols": [s['symbol'] for s in test_symbols],
                     "status": "FAIL",
-                    "error": "返回空数据"
+                    "error": result[0].text if result else "返回空数据"
                 })
                 print(f"❌ 批量分析失败")
-                
+
         except Exception as e:
             self.test_results.append({
                 "test": "batch_analysis",
@@ -41,25 +41,24 @@ def sample_stock_data():
         freq='D'
     )
     
-    # 模拟价格数据
+    # 模拟价格数据（全程向量化，随机数一次性批量抽取）
     np.random.seed(42)  # 确保可重现性
+    n = len(dates)
     base_price = 10.0
-    returns = np.random.normal(0, 0.02, len(dates))
-    prices = [base_price]
-    
-    for ret in returns[1:]:
-        prices.append(prices[-1] * (1 + ret))
-    
+    returns = np.random.normal(0, 0.02, n)
+    returns[0] = 0.0
+    prices = base_price * np.cumprod(1 + returns)
+
     data = pd.DataFrame({
         'date': dates,
         'open': prices,
-        'high': [p * (1 + abs(np.random.normal(0, 0.01))) for p in prices],
-        'low': [p * (1 - abs(np.random.normal(0, 0.01))) for p in prices],
+        'high': prices * (1 + np.abs(np.random.normal(0, 0.01, n))),
+        'low': prices * (1 - np.abs(np.random.normal(0, 0.01, n))),
         'close': prices,
-        'volume': np.random.randint(1000000, 10000000, len(dates)),
-        'amount': [p * v for p, v in zip(prices, np.random.randint(1000000, 10000000, len(dates)))]
+        'volume': np.random.randint(1000000, 10000000, n),
+        'amount': prices * np.random.randint(1000000, 10000000, n)
     })
-    
+
     return data
 
 
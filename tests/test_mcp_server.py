@@ -97,11 +97,48 @@ class TestCleanSurgeAnalyzer:
         # 测试默认值
         assert isinstance(self.analyzer.surge_threshold, float)
         assert isinstance(self.analyzer.volume_threshold, float)
-        
+
         # 测试值的合理性
         assert 0 < self.analyzer.surge_threshold < 100
         assert 0 < self.analyzer.volume_threshold < 10
 
+    @pytest.mark.asyncio
+    async def test_repeat_request_served_from_memory_cache(self, monkeypatch):
+        """重复/更短窗口的请求应由内存缓存切片返回，且只抓取一次。
+
+        akshare返回的日期列是datetime.date对象，回归覆盖：
+        缓存命中路径用日期字符串做cutoff切片不能抛TypeError。
+        """
+        import pandas as pd
+        from datetime import date, timedelta
+        import surge_analysis_mcp_server as srv
+
+        today = date.today()
+        n = 360
+        df = pd.DataFrame({
+            '日期': [today - timedelta(days=i) for i in range(n - 1, -1, -1)],
+            '收盘': [10.0 + i * 0.01 for i in range(n)],
+            '成交量': [1000000 + i for i in range(n)],
+        })
+
+        calls = []
+
+        def fake_fetch(func, key, ttl, **kwargs):
+            calls.append(key)
+            return df.copy()
+
+        monkeypatch.setattr(srv, '_cached_fetch', fake_fetch)
+
+        first = await self.analyzer.analyze_stock(
+            "000001", days=360, fetch_company=False)
+        second = await self.analyzer.analyze_stock(
+            "000001", days=30, fetch_company=False)
+
+        assert isinstance(first, dict)
+        assert isinstance(second, dict)
+        # 第二次请求完全由内存缓存切片满足，不再发起抓取
+        assert len(calls) == 1
+
 
 if __name__ == "__main__":
     pytest.main([__file__])
\ No newline at end of file
@@ -7,159 +7,413 @@ Universal Stock Surge Analyzer
 import asyncio
 import sys
 import os
+import time
+import hashlib
+import logging
+import functools
+from pathlib import Path
 from datetime import datetime, timedelta
 import pandas as pd
+import numpy as np
 import akshare as ak
+import requests
 import argparse
 
-# 添加当前目录到Python路径
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+# numba为可选加速依赖，缺失时数值内核按普通Python执行
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# 添加当前目录到Python路径（解析一次，后续复用）
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE))
+
+from config import CacheConfig
+
+# 分析过程的控制台输出统一走logger，库内调用默认静默
+log = logging.getLogger(__name__)
+log.setLevel(logging.WARNING)
+
+# verbose输出走独立的子logger：级别和handler都挂在子logger上，
+# 不随后续实例的构造而改动，静默实例也压不掉它
+_console_log = log.getChild("console")
+_console_log.setLevel(logging.INFO)
+
+# 限制并发akshare请求数，避免批量扇出时触发上游限流
+_FETCH_SEMAPHORE = asyncio.Semaphore(8)
+
+# akshare抓取结果的磁盘缓存：行情缓存1个交易日，公司信息近乎静态缓存1周
+_CACHE_CONFIG = CacheConfig()
+_HIST_TTL = _CACHE_CONFIG.historical_data_ttl
+_COMPANY_TTL = 7 * 86400
+
+# 公司信息只关注这几个字段
+_COMPANY_KEYS = frozenset(['总市值', '流通市值', '行业', '总股本'])
+
+# akshare行情表的中文列名在入口处统一映射为ASCII别名
+_COLUMN_ALIASES = {
+    '日期': 'date',
+    '开盘': 'open',
+    '收盘': 'close',
+    '最高': 'high',
+    '最低': 'low',
+    '成交量': 'volume',
+}
+
+
+def _cached_fetch(func, key, ttl, **kwargs):
+    """按key磁盘缓存akshare抓取的DataFrame，TTL内直接读取"""
+    digest = hashlib.md5(key.encode()).hexdigest()
+    path = os.path.join(_CACHE_CONFIG.cache_directory, "akshare", f"{digest}.pkl")
+
+    if os.path.exists(path) and time.time() - os.path.getmtime(path) < ttl:
+        try:
+            return pd.read_pickle(path)
+        except Exception:
+            pass  # 缓存损坏时重新抓取
+
+    df = func(**kwargs)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        df.to_pickle(path)
+    except Exception:
+        pass  # 缓存写失败不影响正常返回
+    return df
+
+
+def _maybe_njit(func):
+    """有numba时JIT编译数值内核，否则原样返回"""
+    if numba is not None:
+        return numba.njit(cache=True)(func)
+    return func
+
+
+@_maybe_njit
+def _daily_returns_kernel(closes):
+    """逐日涨跌幅(%)，对齐到closes[1:]"""
+    n = closes.shape[0]
+    returns = np.empty(n - 1, closes.dtype)
+    for i in range(1, n):
+        returns[i - 1] = (closes[i] - closes[i - 1]) / closes[i - 1] * 100.0
+    return returns
+
+
+if numba is None:
+    # 没有JIT时逐元素Python循环反而最慢，换成numpy向量化等价实现
+    def _daily_returns_kernel(closes):  # noqa: F811
+        """逐日涨跌幅(%)，对齐到closes[1:]"""
+        return np.diff(closes) / closes[:-1] * 100.0
+
+
+@_maybe_njit
+def _volume_spike_kernel(volumes, threshold):
+    """10日均量放大倍数，未触发阈值处为0"""
+    n = volumes.shape[0]
+    ratios = np.zeros(n, volumes.dtype)
+    avg = 0.0
+    for j in range(min(10, n)):
+        avg += volumes[j]
+    for i in range(10, n):
+        mean = avg / 10.0
+        if mean > 0 and volumes[i] > mean * threshold:
+            ratios[i] = volumes[i] / mean
+        # 滑动窗口增量更新，避免每步重算10项求和
+        avg += volumes[i] - volumes[i - 10]
+    return ratios
+
+
+if numba is None:
+    # 无JIT时改用cumsum一次算出全部10日滚动均量，纯numpy路径
+    def _volume_spike_kernel(volumes, threshold):  # noqa: F811
+        """10日均量放大倍数，未触发阈值处为0"""
+        n = volumes.shape[0]
+        ratios = np.zeros(n, volumes.dtype)
+        if n <= 10:
+            return ratios
+        csum = np.concatenate(([0.0], np.cumsum(volumes)))
+        roll = (csum[10:-1] - csum[:-11]) / 10.0  # roll[k]对应volumes[10+k]
+        tail = volumes[10:]
+        hit = (roll > 0) & (tail > roll * threshold)
+        ratios[10:][hit] = tail[hit] / roll[hit]
+        return ratios
+
+
+@_maybe_njit
+def _scan_kernel(closes, volumes, vol_threshold):
+    """融合扫描：一趟同时产出逐日涨跌幅与10日均量放大倍数，
+    closes/volumes只过一遍缓存"""
+    n = closes.shape[0]
+    returns = np.empty(n - 1, closes.dtype)
+    ratios = np.zeros(n, volumes.dtype)
+    avg = 0.0
+    for i in range(n):
+        if i >= 1:
+            returns[i - 1] = (closes[i] - closes[i - 1]) / closes[i - 1] * 100.0
+        if i < 10:
+            avg += volumes[i]
+        else:
+            mean = avg / 10.0
+            if mean > 0 and volumes[i] > mean * vol_threshold:
+                ratios[i] = volumes[i] / mean
+            avg += volumes[i] - volumes[i - 10]
+    return returns, ratios
+
+
+if numba is None:
+    # 无JIT时融合无收益，直接拼两个向量化内核
+    def _scan_kernel(closes, volumes, vol_threshold):  # noqa: F811
+        """融合扫描的numpy回退：返回(涨跌幅, 放量倍数)"""
+        return (
+            _daily_returns_kernel(closes),
+            _volume_spike_kernel(volumes, vol_threshold)
+        )
+else:
+    # 导入时用微型数组预热JIT，把~秒级的编译延迟从首个真实请求挪到
+    # 进程启动；配合njit(cache=True)，编译产物落盘后下次启动直接复用。
+    # 设SURGE_WARMUP=0可跳过（如只想快速导入做单元测试）
+    if os.getenv('SURGE_WARMUP', '1') == '1':
+        _scan_kernel(np.ones(20, dtype=np.float32),
+                     np.ones(20, dtype=np.float32), 2.0)
+
+
+def _top_k_desc(values, k):
+    """返回values中最大k个元素的下标（降序）。
+    argpartition先O(N)选出k个，再只对这k个排序"""
+    n = values.shape[0]
+    if n <= k:
+        return np.argsort(-values)
+    part = np.argpartition(-values, k - 1)[:k]
+    return part[np.argsort(-values[part])]
 
 
 class UniversalSurgeAnalyzer:
     """通用暴涨分析器"""
     
-    def __init__(self):
+    def __init__(self, verbose: bool = False):
         self.surge_threshold = 5.0  # 暴涨阈值
         self.volume_threshold = 2.0  # 成交量异常阈值
+        # MCP服务等无人值守场景默认不产出几十行格式化输出，
+        # CLI/交互入口传verbose=True恢复原有控制台报告。
+        # 每个实例绑定自己的logger：verbose实例用带handler的INFO级
+        # 子logger，静默实例用WARNING级的模块logger，先后构造互不干扰
+        self.verbose = verbose
+        self._log = _console_log if verbose else log
+        if verbose and not _console_log.handlers:
+            handler = logging.StreamHandler()
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            _console_log.addHandler(handler)
         
-    async def analyze_stock(self, symbol: str, name: str = None, days: int = 180):
-        """分析指定股票"""
-        print(f"🔍 {name or symbol}暴涨逻辑分析")
-        print("=" * 50)
-        
-        try:
-            # 获取数据
-            print("📡 获取股票数据...")
+    def analyze_stock(self, symbol: str, name: str = None, days: int = 180,
+                      start_date_str: str = None, end_date_str: str = None):
+        """分析指定股票。
+
+        参数校验放在协程体外，坏输入在调用处立即抛ValueError，
+        不浪费一次HTTP往返，也不会被分析流程的except吞掉。
+        批量调用方可传入预先算好的start_date_str/end_date_str，
+        整批共用同一对日期串，缓存key也随之稳定。
+        """
+        if not symbol or not symbol.strip():
+            raise ValueError("股票代码不能为空")
+        if days <= 0:
+            raise ValueError("分析天数必须为正数")
+        if days > 3650:
+            raise ValueError("分析天数最多10年(3650天)")
+        return self._analyze_stock(symbol, name, days, start_date_str, end_date_str)
+
+    async def _analyze_stock(self, symbol: str, name: str, days: int,
+                             start_str: str = None, end_str: str = None):
+        """分析流程主体"""
+        self._log.info("🔍 %s暴涨逻辑分析", name or symbol)
+        self._log.info("=" * 50)
+
+        # 获取数据
+        self._log.info("📡 获取股票数据...")
+        if start_str is None or end_str is None:
             end_date = datetime.now()
             start_date = end_date - timedelta(days=days)
-            
-            hist_df = ak.stock_zh_a_hist(
-                symbol=symbol,
-                period="daily", 
-                start_date=start_date.strftime("%Y%m%d"),
-                end_date=end_date.strftime("%Y%m%d"),
-                adjust="qfq"
-            )
-            
-            if hist_df.empty:
-                print("❌ 数据获取失败")
-                return None
-            
-            print(f"✅ 获取 {len(hist_df)} 个数据点")
-            
-            # 基本分析
-            analysis_result = self._perform_basic_analysis(hist_df)
-            
-            # 暴涨分析
-            surge_analysis = self._analyze_surges(hist_df)
-            
-            # 成交量分析
-            volume_analysis = self._analyze_volume(hist_df)
-            
-            # 获取公司信息
-            company_info = self._get_company_info(symbol)
-            
-            # 生成报告
-            self._generate_report(analysis_result, surge_analysis, volume_analysis, company_info, name or symbol)
-            
-            return {
-                'basic': analysis_result,
-                'surges': surge_analysis,
-                'volume': volume_analysis,
-                'company': company_info
-            }
-            
-        except Exception as e:
-            print(f"❌ 分析过程出错: {e}")
+            start_str = start_date.strftime("%Y%m%d")
+            end_str = end_date.strftime("%Y%m%d")
+
+        # try只包住akshare抓取这一步，且只接数据源层面的异常；
+        # 后续分析阶段的bug直接带着回溯抛给调用方，不再被吞成None
+        try:
+            # akshare是阻塞调用，放进线程池让协程真正并发扇出
+            async with _FETCH_SEMAPHORE:
+                hist_df = await asyncio.to_thread(
+                    _cached_fetch,
+                    ak.stock_zh_a_hist,
+                    f"hist:{symbol}:{start_str}:{end_str}:qfq",
+                    _HIST_TTL,
+                    symbol=symbol,
+                    period="daily",
+                    start_date=start_str,
+                    end_date=end_str,
+                    adjust="qfq"
+                )
+        except (requests.RequestException, ValueError, KeyError) as e:
+            self._log.warning("❌ 数据获取失败: %s", e)
+            return None
+
+        if hist_df.empty:
+            self._log.warning("❌ 数据获取失败")
             return None
+
+        self._log.info("✅ 获取 %d 个数据点", len(hist_df))
+
+        # akshare的中文列名在入口处统一改成ASCII别名，
+        # 后续全部按别名取列，不再到处散落中文字符串
+        hist_df = hist_df.rename(columns=_COLUMN_ALIASES)
+
+        # 列数据一次性物化为SoA（结构化数组束），三个分析阶段共享，
+        # 不再各自tolist/to_numpy重复转换；涨跌幅也只算一遍。
+        # 价格/成交量的量级对float32绰绰有余，降精度省一半内存带宽
+        closes = hist_df['close'].to_numpy(dtype=np.float32)
+        volumes = hist_df['volume'].to_numpy(dtype=np.float32)
+        returns, spike_ratios = _scan_kernel(closes, volumes, self.volume_threshold)
+        soa = {
+            'dates': hist_df['date'].tolist(),
+            'closes': closes,
+            'volumes': volumes,
+            'returns': returns,
+            'spike_ratios': spike_ratios
+        }
+
+        # 基本分析
+        analysis_result = self._perform_basic_analysis(soa)
+
+        # 暴涨分析
+        surge_analysis = self._analyze_surges(soa)
+
+        # 成交量分析
+        volume_analysis = self._analyze_volume(soa)
+
+        # 获取公司信息
+        company_info = await self._get_company_info(symbol)
+
+        # 生成报告
+        self._generate_report(analysis_result, surge_analysis, volume_analysis, company_info, name or symbol)
+
+        # 预平铺的汇总字段，调用方无需再逐层取嵌套dict
+        summary = {
+            'current_price': analysis_result['current_price'],
+            'total_return': analysis_result['total_return'],
+            'volatility': analysis_result['volatility'],
+            'surge_count': len(surge_analysis),
+            'volume_spike_count': len(volume_analysis['spikes']),
+            'max_surge': max((s['return'] for s in surge_analysis), default=0.0),
+            'industry': company_info.get('行业', '未知'),
+            'market_cap': company_info.get('总市值', '未知')
+        }
+
+        return {
+            'basic': analysis_result,
+            'surges': surge_analysis,
+            'volume': volume_analysis,
+            'company': company_info,
+            'summary': summary
+        }
     
-    def _perform_basic_analysis(self, df):
+    def _perform_basic_analysis(self, soa):
         """基本分析"""
-        closes = df['收盘'].tolist()
-        
-        current_price = closes[-1]
-        start_price = closes[0]
+        closes = soa['closes']
+
+        current_price = float(closes[-1])
+        start_price = float(closes[0])
         total_return = (current_price - start_price) / start_price * 100
-        
+
+        # 统计全走numpy归约；波动率直接取SoA里现成的涨跌幅序列求
+        # 样本标准差，等价于pct_change().std()*100但不建Series
         result = {
             'current_price': current_price,
             'start_price': start_price,
             'total_return': total_return,
-            'max_price': max(closes),
-            'min_price': min(closes),
-            'volatility': pd.Series(closes).pct_change().std() * 100
+            'max_price': float(closes.max()),
+            'min_price': float(closes.min()),
+            'volatility': float(np.std(soa['returns'], ddof=1))
         }
         
-        print(f"📊 基本表现:")
-        print(f"  当前价格: ¥{current_price:.2f}")
-        print(f"  期间涨幅: {total_return:+.2f}%")
-        print(f"  最高价: ¥{result['max_price']:.2f}")
-        print(f"  最低价: ¥{result['min_price']:.2f}")
-        print(f"  波动率: {result['volatility']:.2f}%")
+        self._log.info("📊 基本表现:")
+        self._log.info("  当前价格: ¥%.2f", current_price)
+        self._log.info("  期间涨幅: %+.2f%%", total_return)
+        self._log.info("  最高价: ¥%.2f", result['max_price'])
+        self._log.info("  最低价: ¥%.2f", result['min_price'])
+        self._log.info("  波动率: %.2f%%", result['volatility'])
         
         return result
     
-    def _analyze_surges(self, df):
+    def _analyze_surges(self, soa):
         """暴涨分析"""
-        closes = df['收盘'].tolist()
-        dates = df['日期'].tolist()
-        volumes = df['成交量'].tolist()
-        
+        closes = soa['closes']
+        dates = soa['dates']
+        volumes = soa['volumes']
+        daily_returns = soa['returns']
+
+        surge_idx = np.flatnonzero(daily_returns > self.surge_threshold)
+        surge_rets = daily_returns[surge_idx]
+
         surge_days = []
-        for i in range(1, len(closes)):
-            daily_return = (closes[i] - closes[i-1]) / closes[i-1] * 100
-            if daily_return > self.surge_threshold:
-                surge_days.append({
-                    'date': dates[i],
-                    'return': daily_return,
-                    'price': closes[i],
-                    'volume': volumes[i]
-                })
-        
-        print(f"\n🚀 暴涨事件:")
-        print(f"  单日涨幅>{self.surge_threshold}%: {len(surge_days)}天")
-        
-        if surge_days:
-            surge_days.sort(key=lambda x: x['return'], reverse=True)
-            print(f"  前5个暴涨日:")
-            for i, day in enumerate(surge_days[:5], 1):
-                print(f"    {i}. {day['date']}: +{day['return']:.2f}% (¥{day['price']:.2f})")
-        
+        for i in surge_idx:
+            idx = int(i) + 1
+            surge_days.append({
+                'date': dates[idx],
+                'return': float(daily_returns[i]),
+                'price': float(closes[idx]),
+                'volume': float(volumes[idx])
+            })
+
+        self._log.info("\n🚀 暴涨事件:")
+        self._log.info("  单日涨幅>%s%%: %d天", self.surge_threshold, len(surge_days))
+
+        if surge_days and self._log.isEnabledFor(logging.INFO):
+            # 展示只要前5名：argpartition做O(N)选择，再只排这5个
+            top = _top_k_desc(surge_rets, 5)
+            self._log.info("  前5个暴涨日:")
+            for i, j in enumerate(top, 1):
+                day = surge_days[j]
+                self._log.info("    %d. %s: +%.2f%% (¥%.2f)", i, day['date'], day['return'], day['price'])
+
         return surge_days
     
-    def _analyze_volume(self, df):
+    def _analyze_volume(self, soa):
         """成交量分析"""
-        volumes = df['成交量'].tolist()
-        dates = df['日期'].tolist()
-        closes = df['收盘'].tolist()
-        
-        avg_volume = sum(volumes) / len(volumes)
-        current_volume = volumes[-1]
-        max_volume = max(volumes)
-        
-        print(f"\n📊 成交量分析:")
-        print(f"  平均成交量: {avg_volume:,.0f}")
-        print(f"  当前成交量: {current_volume:,.0f} ({current_volume/avg_volume:.1f}倍)")
-        print(f"  最大成交量: {max_volume:,.0f} ({max_volume/avg_volume:.1f}倍)")
-        
-        # 寻找成交量异常日
+        volumes = soa['volumes']
+        dates = soa['dates']
+        daily_returns = soa['returns']
+
+        avg_volume = float(volumes.mean())
+        current_volume = float(volumes[-1])
+        max_volume = float(volumes.max())
+
+        if self._log.isEnabledFor(logging.INFO):
+            # 千分位格式%不支持，保留f-string但整块按日志级别跳过
+            self._log.info("\n📊 成交量分析:")
+            self._log.info(f"  平均成交量: {avg_volume:,.0f}")
+            self._log.info(f"  当前成交量: {current_volume:,.0f} ({current_volume/avg_volume:.1f}倍)")
+            self._log.info(f"  最大成交量: {max_volume:,.0f} ({max_volume/avg_volume:.1f}倍)")
+
+        # 寻找成交量异常日：放量倍数已由融合内核随SoA一起算好
+        spike_ratios = soa['spike_ratios']
+
+        spike_idx = np.flatnonzero(spike_ratios > 0)
+
         volume_spikes = []
-        for i in range(10, len(volumes)):
-            avg_vol = sum(volumes[i-10:i]) / 10
-            if volumes[i] > avg_vol * self.volume_threshold:
-                daily_return = (closes[i] - closes[i-1]) / closes[i-1] * 100 if i > 0 else 0
-                volume_spikes.append({
-                    'date': dates[i],
-                    'volume_ratio': volumes[i] / avg_vol,
-                    'return': daily_return
-                })
-        
-        if volume_spikes:
-            print(f"\n  成交量异常事件 (前5个):")
-            volume_spikes.sort(key=lambda x: x['volume_ratio'], reverse=True)
-            for i, spike in enumerate(volume_spikes[:5], 1):
-                print(f"    {i}. {spike['date']}: 量比{spike['volume_ratio']:.1f}倍, 涨幅{spike['return']:+.2f}%")
+        for i in spike_idx:
+            idx = int(i)
+            # 复用SoA里已算好的涨跌幅（对齐到closes[1:]）
+            daily_return = daily_returns[idx - 1] if idx > 0 else 0
+            volume_spikes.append({
+                'date': dates[idx],
+                'volume_ratio': float(spike_ratios[idx]),
+                'return': float(daily_return)
+            })
+
+        if volume_spikes and self._log.isEnabledFor(logging.INFO):
+            self._log.info("\n  成交量异常事件 (前5个):")
+            top = _top_k_desc(spike_ratios[spike_idx], 5)
+            for i, j in enumerate(top, 1):
+                spike = volume_spikes[j]
+                self._log.info("    %d. %s: 量比%.1f倍, 涨幅%+.2f%%", i, spike['date'], spike['volume_ratio'], spike['return'])
         
         return {
             'avg_volume': avg_volume,
@@ -168,67 +422,97 @@ class UniversalSurgeAnalyzer:
             'spikes': volume_spikes
         }
     
-    def _get_company_info(self, symbol):
+    async def _get_company_info(self, symbol):
         """获取公司信息"""
-        print(f"\n🏢 公司基本信息:")
+        self._log.info("\n🏢 公司基本信息:")
+        # 公司信息是锦上添花，只容忍数据源层面的异常；
+        # 裸except会连KeyboardInterrupt/SystemExit一起吞掉
         try:
-            info = ak.stock_individual_info_em(symbol=symbol)
-            if not info.empty:
-                key_info = {}
-                for _, row in info.iterrows():
-                    item = row.get('item', '')
-                    value = row.get('value', '')
-                    if item in ['总市值', '流通市值', '行业', '总股本']:
-                        key_info[item] = value
-                
-                for key, value in key_info.items():
-                    print(f"  {key}: {value}")
-                
-                return key_info
-        except:
-            print("  信息获取受限")
-        
-        return {}
+            async with _FETCH_SEMAPHORE:
+                info = await asyncio.to_thread(
+                    _cached_fetch,
+                    ak.stock_individual_info_em, f"info:{symbol}", _COMPANY_TTL,
+                    symbol=symbol
+                )
+        except (requests.RequestException, ValueError, KeyError) as e:
+            self._log.info("  信息获取受限: %s", e)
+            return {}
+
+        if info.empty:
+            return {}
+
+        # 一次向量化isin过滤代替逐行iterrows判断
+        sub = info[info['item'].isin(_COMPANY_KEYS)]
+        key_info = dict(zip(sub['item'], sub['value']))
+
+        for key, value in key_info.items():
+            self._log.info("  %s: %s", key, value)
+
+        return key_info
     
     def _generate_report(self, basic, surges, volume, company, stock_name):
         """生成分析报告"""
-        print(f"\n🎯 {stock_name}暴涨逻辑分析")
-        print("=" * 50)
-        
+        # 静默模式下连报告字符串都不拼，直接返回
+        if not self._log.isEnabledFor(logging.INFO):
+            return
+
+        # 报告行先累积到缓冲，最后一次性写出，~15次输出合并成1次
+        lines = [f"\n🎯 {stock_name}暴涨逻辑分析", "=" * 50]
+
         # 基于数据生成逻辑分析
         surge_count = len(surges)
         volume_spike_count = len(volume['spikes'])
-        
+
         # 暴涨特征分析
         if surge_count > 5:
-            print("📈 暴涨特征: 频繁暴涨型")
-            print("  说明: 该股票在过去半年内出现多次单日暴涨")
-            print("  投资建议: 适合短线交易，关注成交量配合")
+            lines += [
+                "📈 暴涨特征: 频繁暴涨型",
+                "  说明: 该股票在过去半年内出现多次单日暴涨",
+                "  投资建议: 适合短线交易，关注成交量配合",
+            ]
         elif surge_count > 0:
-            print("📊 暴涨特征: 间歇暴涨型")
-            print("  说明: 偶尔出现暴涨，可能受消息面影响")
-            print("  投资建议: 关注消息面变化，谨慎追高")
+            lines += [
+                "📊 暴涨特征: 间歇暴涨型",
+                "  说明: 偶尔出现暴涨，可能受消息面影响",
+                "  投资建议: 关注消息面变化，谨慎追高",
+            ]
         else:
-            print("📉 暴涨特征: 稳健型")
-            print("  说明: 价格波动相对平稳，较少出现暴涨")
-            print("  投资建议: 适合长期持有，关注基本面变化")
-        
+            lines += [
+                "📉 暴涨特征: 稳健型",
+                "  说明: 价格波动相对平稳，较少出现暴涨",
+                "  投资建议: 适合长期持有，关注基本面变化",
+            ]
+
         # 成交量配合分析
         if volume_spike_count > surge_count:
-            print("🔥 成交量配合: 量价齐升型")
-            print("  特征: 成交量放大往往伴随价格上涨")
-            print("  策略: 关注放量突破机会")
+            lines += [
+                "🔥 成交量配合: 量价齐升型",
+                "  特征: 成交量放大往往伴随价格上涨",
+                "  策略: 关注放量突破机会",
+            ]
         else:
-            print("📊 成交量配合: 温和放量型")
-            print("  特征: 成交量变化相对温和")
-            print("  策略: 适合稳健操作")
-        
+            lines += [
+                "📊 成交量配合: 温和放量型",
+                "  特征: 成交量变化相对温和",
+                "  策略: 适合稳健操作",
+            ]
+
         # 风险提示
-        print("\n⚠️ 风险提示:")
-        print("  1. 历史表现不代表未来收益")
-        print("  2. 暴涨股票波动较大，注意风险控制")
-        print("  3. 建议结合基本面和技术面综合判断")
-        print("  4. 设置合理的止损和止盈点位")
+        lines += [
+            "\n⚠️ 风险提示:",
+            "  1. 历史表现不代表未来收益",
+            "  2. 暴涨股票波动较大，注意风险控制",
+            "  3. 建议结合基本面和技术面综合判断",
+            "  4. 设置合理的止损和止盈点位",
+        ]
+
+        self._log.info("\n".join(lines))
+
+
+@functools.lru_cache(maxsize=None)
+def get_analyzer(verbose: bool = False):
+    """获取进程级共享的分析器实例，避免每个入口各建一份"""
+    return UniversalSurgeAnalyzer(verbose=verbose)
 
 
 async def main():
@@ -240,7 +524,7 @@ async def main():
     
     args = parser.parse_args()
     
-    analyzer = UniversalSurgeAnalyzer()
+    analyzer = get_analyzer(verbose=True)
     await analyzer.analyze_stock(args.symbol, args.name, args.days)
 
 